@@ -1,23 +1,42 @@
 import hashlib
+import http.client
 import json
-import shutil
 import sys
 import tarfile
 import tempfile
+import threading
 import os
 import logging
+import mmap
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Union
+from typing import Any, List, Sequence, Tuple, Union
 from urllib.error import URLError, ContentTooShortError, HTTPError
 from urllib.parse import urlparse
-from urllib.request import urlopen, urlretrieve
+from urllib.request import Request, urlopen
 import zipfile
 
 from BaseProjects.config.type_definitions import PathLike
 from BaseProjects.utils.module import look_up_option, optional_import
 
 gdown, has_gdown = optional_import("gdown", "4.7.3")
-
+libarchive, has_libarchive = optional_import("libarchive")
+tqdm, has_tqdm = optional_import("tqdm", "4.47.0", "tqdm")
+
+MMAP_HASH_THRESHOLD = 10 * 1024 * 1024
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+MERKLE_BLOCK_SIZE = 16 * 1024 * 1024
+# seconds to wait for the `HEAD` request validating an existing file, it must not block offline re-runs
+VALIDATORS_TIMEOUT = 5
+MERKLE_PREFIX = "merkle-"
+HASH_CACHE_SIZE = 256
+_HASH_CACHE: "OrderedDict[tuple, str]" = OrderedDict()
+_HASH_CACHE_LOCK = threading.Lock()
+HASH_STATE_DB = Path("~", ".cache", "monai", "hash_state.sqlite").expanduser()
 DEFAULT_FMT = "%(asctime)s - %(levelname)s - %(message)s"
 SUPPORTED_HASH_TYPES = {
     "md5": hashlib.md5,
@@ -68,63 +87,530 @@ def get_logger(
 
 
 logger = get_logger("default.apps")
+# os.path.sep = path separator, os.path.altsep = alternative separator
+_BASENAME_STRIP_CHARS = os.path.sep + (os.path.altsep or "") + "/ "
 
 
 def _basename(p: PathLike):
     """
     get the last part of the path (removing the trailing slash if it exists)
     """
-    # os.path.sep = path separator, os.path.altsep = root dir
-    sep = os.path.sep + (os.path.altsep or "") + "/ "
     # Path.name = base name of path
-    return Path(f"{p}".rstrip(sep)).name
+    return Path(os.fspath(p).rstrip(_BASENAME_STRIP_CHARS)).name
+
+
+def _new_hasher(hash_type: str):
+    """
+    Create a new hash object of `hash_type`, the hash is not used for security purposes.
+    """
+    actual_hash_func = look_up_option(hash_type, SUPPORTED_HASH_TYPES)
+    if sys.version_info > (3, 9):
+        return actual_hash_func(usedforsecurity=False)
+    return actual_hash_func()
+
+
+def _hash_file(filepath: PathLike, hasher) -> None:
+    """
+    Feed the content of `filepath` into `hasher`.
+    Files larger than `MMAP_HASH_THRESHOLD` are memory-mapped and hashed with a single `update` call,
+    smaller files are read in chunks as the mapping setup would dominate.
+    """
+    # O_SEQUENTIAL hints the access pattern on Windows
+    fd = os.open(filepath, os.O_RDONLY | getattr(os, "O_BINARY", 0) | getattr(os, "O_SEQUENTIAL", 0))
+    size = os.fstat(fd).st_size
+    if size < MMAP_HASH_THRESHOLD:
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        # a single buffer is reused for all the chunks, instead of allocating a new bytes object per read
+        buf = bytearray(min(size, HASH_CHUNK_SIZE) or 1)
+        view = memoryview(buf)
+        # unbuffered, the chunks are large enough that an extra buffer layer only adds copies
+        with os.fdopen(fd, "rb", buffering=0) as f:
+            while True:
+                n = f.readinto(buf)
+                if not n:
+                    break
+                hasher.update(view[:n])
+        return
+    try:
+        with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+            if hasattr(mm, "madvise"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            hasher.update(mm)
+    finally:
+        os.close(fd)
+
+
+@lru_cache(maxsize=1)
+def _open_state_db() -> Union[sqlite3.Connection, None]:
+    """
+    Open the database persisting verified digests across processes, return `None` if it can't be opened.
+    """
+    try:
+        HASH_STATE_DB.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(HASH_STATE_DB, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS hashes (path TEXT, inode INT, mtime_ns INT, size INT, algo TEXT, digest TEXT, "
+            "PRIMARY KEY(path, algo))"
+        )
+        db.commit()
+    except (OSError, sqlite3.Error) as e:
+        logger.warning(f"Hash state database {HASH_STATE_DB} is not available: {e}")
+        return None
+    return db
+
+
+def _load_state_digest(path: str, st: os.stat_result, hash_type: str) -> Union[str, None]:
+    """
+    Get the persisted digest of `path`, `None` if it is unknown or the file has changed since it was recorded.
+    """
+    db = _open_state_db()
+    if db is None:
+        return None
+    try:
+        with _HASH_CACHE_LOCK:
+            row = db.execute(
+                "SELECT inode, mtime_ns, size, digest FROM hashes WHERE path=? AND algo=?", (path, hash_type)
+            ).fetchone()
+    except sqlite3.Error:
+        return None
+    if row is None or tuple(row[:3]) != (st.st_ino, st.st_mtime_ns, st.st_size):
+        return None
+    return row[3]
+
+
+def _save_state_digest(path: str, st: os.stat_result, hash_type: str, digest: str) -> None:
+    """
+    Persist the digest of `path` together with the file metadata used to validate it.
+    """
+    db = _open_state_db()
+    if db is None:
+        return
+    try:
+        with _HASH_CACHE_LOCK:
+            db.execute(
+                "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?)",
+                (path, st.st_ino, st.st_mtime_ns, st.st_size, hash_type, digest),
+            )
+            db.commit()
+    except sqlite3.Error as e:
+        logger.warning(f"Failed to record the digest of {path}: {e}")
+
+
+def _base_hash_type(hash_type: str) -> str:
+    """
+    Strip the Merkle mode prefix of `hash_type`, such as `"merkle-sha256"` -> `"sha256"`.
+    """
+    return hash_type[len(MERKLE_PREFIX):] if hash_type.startswith(MERKLE_PREFIX) else hash_type
+
+
+def _merkle_hexdigest(filepath: PathLike, hash_type: str, num_workers: Union[int, None] = None) -> str:
+    """
+    Compute the Merkle-style digest of `filepath`: each `MERKLE_BLOCK_SIZE` block is hashed in a thread pool
+    (`hashlib` releases the GIL while hashing), the root is the `hash_type` digest of the concatenated leaf digests.
+    """
+    def _leaf_digest(offset: int) -> bytes:
+        hasher = _new_hasher(hash_type)
+        with open(filepath, "rb") as f:
+            f.seek(offset)
+            hasher.update(f.read(MERKLE_BLOCK_SIZE))
+        return hasher.digest()
+
+    size = os.stat(filepath).st_size
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        leaves = list(executor.map(_leaf_digest, range(0, max(size, 1), MERKLE_BLOCK_SIZE)))
+    root = _new_hasher(hash_type)
+    for leaf in leaves:
+        root.update(leaf)
+    return root.hexdigest()
+
+
+def _compute_hexdigest(filepath: PathLike, hash_type: str) -> str:
+    """
+    Compute the `hash_type` hex digest of `filepath`, `hash_type` may have the `MERKLE_PREFIX`.
+    """
+    if hash_type.startswith(MERKLE_PREFIX):
+        return _merkle_hexdigest(filepath, _base_hash_type(hash_type))
+    hasher = _new_hasher(hash_type)
+    _hash_file(filepath, hasher)
+    return hasher.hexdigest()
+
+
+def _cached_hexdigest(filepath: PathLike, hash_type: str) -> str:
+    """
+    Compute the `hash_type` hex digest of `filepath`.
+    The result is memoized on the resolved path, modification time and size of the file,
+    in memory and in the `HASH_STATE_DB` database, so repeated checks of an unchanged file don't read it again.
+    Set the environment variable `MONAI_HASH_CACHE_DISABLE=1` to always hash the file.
+    """
+    if os.environ.get("MONAI_HASH_CACHE_DISABLE", "0") == "1":
+        return _compute_hexdigest(filepath, hash_type)
+    digest = _lookup_cached_hexdigest(filepath, hash_type)
+    if digest is None:
+        st = os.stat(filepath)
+        path = os.fspath(Path(filepath).resolve())
+        digest = _compute_hexdigest(filepath, hash_type)
+        _save_state_digest(path, st, hash_type, digest)
+        _remember_hexdigest((path, st.st_mtime_ns, st.st_size, hash_type), digest)
+    return digest
+
+
+def _remember_hexdigest(key: tuple, digest: str) -> None:
+    with _HASH_CACHE_LOCK:
+        _HASH_CACHE[key] = digest
+        if len(_HASH_CACHE) > HASH_CACHE_SIZE:
+            _HASH_CACHE.popitem(last=False)
+
+
+def _lookup_cached_hexdigest(filepath: PathLike, hash_type: str) -> Union[str, None]:
+    """
+    Get the memoized `hash_type` hex digest of `filepath` without reading the file,
+    `None` if it is not memoized, the file has changed or the cache is disabled, see also: :py:func:`_cached_hexdigest`.
+    """
+    if os.environ.get("MONAI_HASH_CACHE_DISABLE", "0") == "1":
+        return None
+    st = os.stat(filepath)
+    path = os.fspath(Path(filepath).resolve())
+    key = (path, st.st_mtime_ns, st.st_size, hash_type)
+    with _HASH_CACHE_LOCK:
+        digest = _HASH_CACHE.get(key)
+        if digest is not None:
+            _HASH_CACHE.move_to_end(key)
+            return digest
+    digest = _load_state_digest(path, st, hash_type)
+    if digest is not None:
+        _remember_hexdigest(key, digest)
+    return digest
+
+
+def get_hash_val(filepath: PathLike, hash_type: str) -> Union[str, bool]:
+    """
+    Compute the hash value of specified file, `False` if the file can't be read.
+
+    Args:
+        filepath: path of source file to compute hash value.
+        hash_type: type of hash algorithm to use, such as `"md5"`, or `"merkle-sha256"` for the Merkle mode.
+    """
+    look_up_option(_base_hash_type(hash_type), SUPPORTED_HASH_TYPES)
+
+    try:
+        return _cached_hexdigest(filepath, hash_type)
+    except Exception as e:
+        logger.error(f"Exception in get_hash_val: {e}")
+        return False
 
 
-def check_hash(filepath: PathLike, val: Union[str, None] = None, hash_type: str = "md5"):
+def check_hash(
+        filepath: PathLike,
+        val: Union[str, None] = None,
+        hash_type: str = "md5",
+        expected_size: Union[int, None] = None,
+):
     """
     Verify hash signature of specified file.
 
     Args:
         filepath: path of source file to verify hash value.
         val: expected hash value of the file.
+            a value such as `"merkle-sha256:<digest>"` selects the Merkle mode of the given hash type,
+            in which the blocks of the file are hashed in parallel, and overrides `hash_type`.
         hash_type: type of hash algorithm to use, default is `"md5"`.
             The supported hash types are `"md5"`, `"sha1"`, `"sha256"`, `"sha512"`.
             See also: :py:data:`monai.apps.utils.SUPPORTED_HASH_TYPES`.
+        expected_size: expected size of the file in bytes, if given, a file of another size fails the check
+            without being hashed.
     """
+    if expected_size is not None:
+        try:
+            size = os.stat(filepath).st_size
+        except OSError as e:
+            logger.error(f"Exception in check_hash: {e}")
+            return False
+        if size != expected_size:
+            logger.error(f"check_hash failed, size of '{_basename(filepath)}' is {size}, expected {expected_size}.")
+            return False
     if val is None:
         logger.info(f"Excepted {hash_type} is None, skip {hash_type} check for file {filepath}.")
         return True
-    actual_hash_func = look_up_option(hash_type, SUPPORTED_HASH_TYPES)
-
-    if sys.version_info > (3, 9):
-        actual_hash = actual_hash_func(usedforsecurity=False)
-    else:
-        actual_hash = actual_hash_func()
-
-    try:
-        with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                actual_hash.update(chunk)
-    except Exception as e:
-        logger.error("Exception in check_hash: {e}")
+    if val.startswith(MERKLE_PREFIX):
+        if ":" not in val:
+            logger.error(f"check_hash failed, '{val}' is not a Merkle value such as 'merkle-sha256:<digest>'.")
+            return False
+        hash_type, val = val.split(":", 1)
+    actual_hash = get_hash_val(filepath, hash_type)
+    if actual_hash is False:
         return False
-    if val != actual_hash.hexdigest():
-        logger.error(f"check_hash failed {actual_hash.hexdigest()}.")
+    if val != actual_hash:
+        logger.error(f"check_hash failed {actual_hash}.")
         return False
 
     logger.info(f"Verified '{_basename(filepath)}', {hash_type}: {val}.")
     return True
 
 
-def _download_with_progress(url: str, filepath: Path, progress: bool = True):
+def check_hashes_bulk(
+        paths_and_vals: Sequence[Tuple[PathLike, Union[str, None]]],
+        hash_type: str = "md5",
+        num_workers: Union[int, None] = None,
+) -> List[bool]:
+    """
+    Verify hash signatures of multiple files concurrently, `hashlib` releases the GIL while hashing.
+
+    Args:
+        paths_and_vals: pairs of the file path and its expected hash value, see also: :py:func:`check_hash`.
+        hash_type: type of hash algorithm to use, default is `"md5"`.
+        num_workers: the maximum number of threads, defaults to the `ThreadPoolExecutor` default.
+
+    Returns:
+        the results of :py:func:`check_hash` in the order of `paths_and_vals`.
+    """
+    with ThreadPoolExecutor(max_workers=num_workers) as executor:
+        return list(executor.map(lambda item: check_hash(item[0], item[1], hash_type), paths_and_vals))
+
+
+def _download_with_progress(
+        url: str,
+        filepath: Path,
+        progress: bool = True,
+        hash_type: Union[str, None] = None,
+        response_headers: Union[dict, None] = None,
+) -> Union[str, None]:
     """
     Retrieve file from `url` to `filepath`, optionally showing a progress bar.
+    An existing partial `filepath` is resumed with a `Range` request conditioned by `If-Range` on the validator of
+    the response it was started from, if there is no such validator, the server doesn't honor the range,
+    the remote content has changed or the partial file is larger than it, the download restarts from the beginning.
+    If `hash_type` is given, the received bytes are hashed while being written and the hex digest is returned,
+    so that the downloaded file doesn't need to be read back for verification.
+    If `response_headers` is given, it is updated with the headers of the response.
     """
+    hasher = _new_hasher(hash_type) if hash_type else None
+    range_validator_path = _validators_path(filepath)
+    offset = filepath.stat().st_size if filepath.exists() else 0
     try:
-        urlretrieve(url, filepath)
-    except (URLError, ContentTooShortError, HTTPError) as e:
+        range_validator = range_validator_path.read_text() if offset else ""
+    except OSError:
+        range_validator = ""
+    request = Request(url)
+    if range_validator:
+        request.add_header("Range", f"bytes={offset}-")
+        # the server sends the full content if it has changed since the partial download
+        request.add_header("If-Range", range_validator)
+    else:
+        offset = 0
+    pbar = None
+    range_error = None
+    try:
+        with urlopen(request) as response:
+            headers = response.info()
+            if response_headers is not None:
+                response_headers.update(headers.items())
+            if response.status != 206:  # full content
+                offset = 0
+                _save_range_validator(range_validator_path, headers)
+            if offset and hasher is not None:
+                _hash_file(filepath, hasher)
+            total = int(headers.get("Content-Length", -1))
+            if progress and has_tqdm:
+                pbar = tqdm(
+                    total=offset + total if total >= 0 else None,
+                    initial=offset,
+                    unit="B",
+                    unit_scale=True,
+                    unit_divisor=1024,
+                    miniters=1,
+                    desc=_basename(filepath),
+                )
+            received = 0
+            with open(filepath, "r+b" if offset else "wb", buffering=DOWNLOAD_CHUNK_SIZE) as out:
+                out.seek(offset)
+                if total > 0 and hasattr(os, "posix_fallocate"):
+                    try:  # reserve the space in one extent to reduce fragmentation
+                        os.posix_fallocate(out.fileno(), offset, total)
+                    except OSError:
+                        pass  # not supported by the file system
+                try:
+                    for chunk in iter(lambda: response.read(DOWNLOAD_CHUNK_SIZE), b""):
+                        out.write(chunk)
+                        if hasher is not None:
+                            hasher.update(chunk)
+                        if pbar is not None:
+                            pbar.update(len(chunk))
+                        received += len(chunk)
+                finally:
+                    # drop the reserved space beyond the received bytes, also when the download is interrupted,
+                    # so that the size of the partial file is where the next call resumes
+                    out.truncate(offset + received)
+        if received < total:
+            raise ContentTooShortError(
+                f"retrieval incomplete: got only {received} out of {total} bytes", (f"{filepath}", headers)
+            )
+    except HTTPError as e:
+        if e.code != 416 or not offset:
+            logger.error(f"Download failed from {url} to {filepath}.")
+            raise e
+        range_error = e  # 416 Range Not Satisfiable, the partial file is not shorter than the remote content
+    except (URLError, ContentTooShortError) as e:
         logger.error(f"Download failed from {url} to {filepath}.")
         raise e
+    finally:
+        if pbar is not None:
+            pbar.close()
+    if range_error is not None:
+        # such as "bytes */1234", the total size of the remote content
+        if range_error.headers.get("Content-Range", "").rpartition("/")[2] != f"{offset}":
+            filepath.unlink()
+            return _download_with_progress(url, filepath, progress, hash_type, response_headers)
+        logger.info(f"Partial download {filepath} is already complete.")
+        if response_headers is not None:
+            response_headers.update(range_error.headers.items())
+        if hasher is not None:
+            _hash_file(filepath, hasher)
+    return hasher.hexdigest() if hasher is not None else None
+
+
+def _save_range_validator(path: Path, headers) -> None:
+    """
+    Save the validator of a full content response to `path`, to be sent as `If-Range` when resuming the download.
+    Only a strong `ETag` or a `Last-Modified` date can be used, without them the download is not resumable.
+    """
+    etag = headers.get("ETag")
+    validator = etag if etag and not etag.startswith("W/") else headers.get("Last-Modified")
+    try:
+        if validator:
+            path.write_text(validator)
+        elif path.exists():
+            path.unlink()
+    except OSError as e:
+        logger.warning(f"Failed to record the validator of {path}: {e}")
+
+
+def _download_from_google_drive(
+        url: str, filepath: Path, progress: bool = True, hash_type: Union[str, None] = None, **gdown_kwargs: Any
+) -> None:
+    """
+    Retrieve a Google Drive file from `url` to `filepath` with `gdown`, the file is not hashed during the download.
+    """
+    if not has_gdown:
+        raise RuntimeError("To download files from Google Drive, please install the gdown dependency.")
+    if "fuzzy" not in gdown_kwargs:
+        gdown_kwargs["fuzzy"] = True
+    gdown.download(url, f"{filepath}", quiet=not progress, **gdown_kwargs)
+
+
+def _download_from_yandex(
+        url: str, filepath: Path, progress: bool = True, hash_type: Union[str, None] = None, **kwargs: Any
+) -> Union[str, None]:
+    """
+    Resolve the download link of a Yandex Disk resource `url` and retrieve it to `filepath`.
+    """
+    with urlopen(url) as response:
+        code = response.getcode()
+        if code == 200:
+            _download_url = json.load(response)["href"]
+            return _download_with_progress(_download_url, filepath, progress, hash_type)
+    raise RuntimeError(
+        f"Error code {code}, received from {url} "
+        + f"to {filepath} failed due to network issue or denied permission."
+    )
+
+
+# download handlers of the hosts which don't serve the file content at the given URL, by network location
+_DOWNLOAD_HANDLERS = {
+    "drive.google.com": _download_from_google_drive,
+    "cloud-api.yandex.net": _download_from_yandex,
+}
+
+
+def _validators_from_headers(headers, size: Union[str, None]) -> Union[dict, None]:
+    """
+    Get the `ETag` and `Last-Modified` validators of the response `headers` with the content `size`,
+    `None` if the server provides neither of them. The header names are case-insensitive.
+    """
+    headers = {key.lower(): value for key, value in headers.items()}
+    validators = {"etag": headers.get("etag"), "last_modified": headers.get("last-modified"), "size": size}
+    if validators["etag"] is None and validators["last_modified"] is None:
+        return None
+    return validators
+
+
+def _remote_validators(url: str) -> Union[dict, None]:
+    """
+    Get the `ETag`, `Last-Modified` and `Content-Length` headers of `url` with a `HEAD` request,
+    `None` if the request fails or times out, or the server provides neither `ETag` nor `Last-Modified`.
+    """
+    try:
+        with urlopen(Request(url, method="HEAD"), timeout=VALIDATORS_TIMEOUT) as response:
+            headers = response.info()
+    except (OSError, ValueError, http.client.HTTPException):  # URLError, HTTPError and timeouts are OSError
+        return None
+    return _validators_from_headers(headers, headers.get("Content-Length"))
+
+
+def _validators_path(filepath: Path) -> Path:
+    return filepath.with_name(f"{filepath.name}.etag")
+
+
+def _validators_record(filepath: Path, url: str, validators: dict, hash_val: str, hash_type: str) -> dict:
+    return {
+        "url": url,
+        **validators,
+        "hash_val": hash_val,
+        "hash_type": hash_type,
+        "mtime_ns": filepath.stat().st_mtime_ns,
+    }
+
+
+def _is_verified_copy(filepath: Path, url: str, validators: dict, hash_val: str, hash_type: str) -> bool:
+    """
+    Whether `filepath` was verified against `hash_val` when `url` had the same `validators`,
+    and the file hasn't been modified since.
+    """
+    try:
+        record = json.loads(_validators_path(filepath).read_text())
+        size = filepath.stat().st_size
+    except (OSError, ValueError):
+        return False
+    if validators["size"] is None or validators["size"] != f"{size}":
+        return False
+    return record == _validators_record(filepath, url, validators, hash_val, hash_type)
+
+
+def _record_validators(filepath: Path, url: str, validators: dict, hash_val: str, hash_type: str) -> None:
+    """
+    Save the `validators` of `url` next to the verified `filepath`, see also: :py:func:`_is_verified_copy`.
+    """
+    try:
+        _validators_path(filepath).write_text(
+            json.dumps(_validators_record(filepath, url, validators, hash_val, hash_type))
+        )
+    except OSError as e:
+        logger.warning(f"Failed to record the validators of {filepath}: {e}")
+
+
+def _discard_partial(partial: Path) -> None:
+    """
+    Remove the partial download `partial`, if it still exists, and the `If-Range` validator recorded with it.
+    """
+    for path in (partial, _validators_path(partial)):
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _has_cached_hexdigest(filepath: Path, val: str, hash_type: str) -> bool:
+    """
+    Whether `check_hash(filepath, val, hash_type)` would use a memoized digest instead of reading the file.
+    """
+    if val.startswith(MERKLE_PREFIX):
+        hash_type = val.split(":", 1)[0]
+    try:
+        return _lookup_cached_hexdigest(filepath, hash_type) is not None
+    except OSError:
+        return False
 
 
 def download_url(
@@ -133,10 +619,12 @@ def download_url(
         hash_val: Union[str, None] = None,
         hash_type: str = "md5",
         progress: bool = True,
+        expected_size: Union[int, None] = None,
         **gdown_kwargs: Any,
 ):
     """
     Download file from specified URL link, support process bar and hash check.
+    An interrupted download is kept as ``<filepath>.part`` and resumed by the next call.
 
     Args:
         url: source URL link to download file.
@@ -146,6 +634,8 @@ def download_url(
             if None, skip hash validation.
         hash_type: 'md5' or 'sha1', defaults to 'md5'.
         progress: whether to display a progress bar.
+        expected_size: expected size of the file in bytes, a file of another size fails the validation
+            without being hashed. if None, skip size validation.
         gdown_kwargs: other args for `gdown` except for the `url`, `output` and `quiet`.
             these args will only be used if download from google drive.
             details of the args of it:
@@ -155,10 +645,10 @@ def download_url(
         RuntimeError: When the hash validation of the ``filepath`` existing file fails.
         RuntimeError: When a network issue or denied permission prevents the
             file download from ``url`` to ``filepath``.
-        URLError: See urllib.request.urlretrieve.
-        HTTPError: See urllib.request.urlretrieve.
-        ContentTooShortError: See urllib.request.urlretrieve.
-        IOError: See urllib.request.urlretrieve.
+        URLError: See urllib.request.urlopen.
+        HTTPError: See urllib.request.urlopen.
+        ContentTooShortError: When fewer bytes than the announced ``Content-Length`` are received.
+        IOError: See urllib.request.urlopen.
         RuntimeError: When the hash validation of the ``url`` downloaded file fails.
 
     """
@@ -167,50 +657,173 @@ def download_url(
         filepath = Path(".", _basename(url)).resolve()
         logger.info(f"Default downloading to '{filepath}'")
     filepath = Path(filepath)
+    netloc = urlparse(url).netloc
+    # the hosts with a download handler don't provide meaningful validators for the file content
+    use_validators = bool(hash_val) and netloc not in _DOWNLOAD_HANDLERS
     if filepath.exists():
-        if not check_hash(filepath, hash_val, hash_type):
+        validators = None
+        # a memoized digest verifies the file locally, the remote validators are only requested when it would be read
+        if use_validators and not _has_cached_hexdigest(filepath, hash_val, hash_type):
+            validators = _remote_validators(url)
+        if (
+            validators is not None
+            and (expected_size is None or filepath.stat().st_size == expected_size)
+            and _is_verified_copy(filepath, url, validators, hash_val, hash_type)
+        ):
+            logger.info(f"File exists and matches the remote {validators}: {filepath}, skipped downloading.")
+            return
+        if not check_hash(filepath, hash_val, hash_type, expected_size):
             raise RuntimeError(
                 f"{hash_type} check of existing file failed: filepath={filepath}, excepted {hash_type}={hash_val}"
             )
+        if validators is not None:
+            _record_validators(filepath, url, validators, hash_val, hash_type)
         logger.info(f"File exists: {filepath}, skipped downloading.")
         return
+    response_headers = {}
+    verified = False
     try:
-        with tempfile.TemporaryDirectory() as tmp_dir:
-            tmp_name = Path(tmp_dir, _basename(filepath))
-            if urlparse(url).netloc == "drive.google.com":
-                if not has_gdown:
-                    raise RuntimeError("To download files from Google Drive, please install the gdown dependency.")
-                if "fuzzy" not in gdown_kwargs:
-                    gdown_kwargs["fuzzy"] = True
-                gdown.download(url, f"{tmp_name}", quite=not progress, **gdown_kwargs)
-            elif urlparse(url).netloc == "cloud-api.yandex.net":
-                with urlopen(url) as response:
-                    code = response.getcode()
-                    if code == 200:
-                        _download_url = json.load(response)["href"]
-                        _download_with_progress(_download_url, tmp_name, progress)
-                    else:
-                        raise RuntimeError(
-                            f"Error code {code}, received from {url} "
-                            + f"to {filepath} failed due to network issue or denied permission."
-                        )
-            else:
-                _download_with_progress(url, tmp_name, progress)
-            if not tmp_name.exists():
-                raise RuntimeError(
-                    f"Download of file from {url} to {filepath} failed due to network issue or denied permission.")
-            filedir = filepath.parent
-            if filedir:
-                os.makedirs(filedir, exist_ok=True)
-            shutil.move(f"{tmp_name}", f"{filepath}")
+        os.makedirs(filepath.parent, exist_ok=True)
+        # the partial download is next to `filepath`, so that moving it is a rename,
+        # and it is kept when the download fails, so that the next call resumes it
+        tmp_name = filepath.with_name(f"{filepath.name}.part")
+        # the Merkle mode hashes the blocks independently, it is verified with `check_hash` after the download
+        merkle = hash_type.startswith(MERKLE_PREFIX) or f"{hash_val}".startswith(MERKLE_PREFIX)
+        inline_hash_type = hash_type if hash_val and not merkle else None
+        handler = _DOWNLOAD_HANDLERS.get(netloc)
+        if handler is not None:
+            inline_digest = handler(url, tmp_name, progress, inline_hash_type, **gdown_kwargs)
+        else:
+            inline_digest = _download_with_progress(url, tmp_name, progress, inline_hash_type, response_headers)
+        if not tmp_name.exists():
+            raise RuntimeError(
+                f"Download of file from {url} to {filepath} failed due to network issue or denied permission.")
+        # verify the partial download before moving it to `filepath`, a corrupted one is discarded
+        if inline_digest is not None and inline_digest != hash_val:
+            _discard_partial(tmp_name)
+            raise RuntimeError(
+                f"{hash_type} check of downloaded file failed: URL={url}, got {hash_type}={inline_digest}."
+            )
+        if inline_digest is None and not check_hash(tmp_name, hash_val, hash_type, expected_size):
+            _discard_partial(tmp_name)
+            raise RuntimeError(f"{hash_type} check of downloaded file failed: URL={url}.")
+        if inline_digest is not None:
+            logger.info(f"Verified '{_basename(filepath)}', {hash_type}: {hash_val}.")
+        os.replace(tmp_name, filepath)
+        _discard_partial(tmp_name)
+        verified = True
     except (PermissionError, NotADirectoryError):
         pass
 
     logger.info(f"Download: {filepath}")
-    if not check_hash(filepath, hash_val, hash_type):
+    if not verified and not check_hash(filepath, hash_val, hash_type, expected_size):
         raise RuntimeError(
             f"{hash_type} check of downloaded file failed: URL={url}."
         )
+    # the validators of the download response itself, a resumed response only has the size of the remaining part
+    if use_validators and response_headers:
+        validators = _validators_from_headers(response_headers, f"{filepath.stat().st_size}")
+        if validators is not None:
+            _record_validators(filepath, url, validators, hash_val, hash_type)
+
+
+def _sanitized_member_name(name: str) -> str:
+    """
+    Sanitize the archive member `name` like `zipfile` does: the drive, the leading separators
+    and the `.` and `..` components are removed, so that the member is extracted inside the output directory.
+    """
+    name = name.replace("/", os.path.sep)
+    if os.path.altsep:
+        name = name.replace(os.path.altsep, os.path.sep)
+    name = os.path.splitdrive(name)[1]
+    return os.path.sep.join(x for x in name.split(os.path.sep) if x not in ("", os.path.curdir, os.path.pardir))
+
+
+def _check_member_paths(filepath: Path):
+    """
+    Check the members of the archive `filepath` before any of them is extracted, a partial extraction would be
+    taken for a complete one by the next `extractall`. Raise a `ValueError` if a member is inside a symbolic link
+    member, which libarchive refuses to extract through.
+    """
+    links = set()
+    with libarchive.file_reader(os.fspath(filepath)) as archive:
+        for entry in archive:
+            name = _sanitized_member_name(entry.pathname)
+            if any(os.fspath(parent) in links for parent in Path(name).parents):
+                raise ValueError(f"Refused to extract the member '{entry.pathname}' through a symbolic link.")
+            if entry.issym:
+                links.add(name)
+
+
+def _rooted_entries(entries, output_dir: str):
+    """
+    Rewrite the paths of the libarchive `entries` to absolute paths under `output_dir`,
+    so that they are extracted there without changing the working directory of the process.
+    The member paths are sanitized like `zipfile` does, see also: :py:func:`_sanitized_member_name`.
+    """
+    for entry in entries:
+        name = _sanitized_member_name(entry.pathname)
+        if not name:
+            continue
+        entry.pathname = os.path.join(output_dir, name)
+        if entry.islnk:  # a hard link target is a member path too
+            entry.linkpath = os.path.join(output_dir, _sanitized_member_name(entry.linkpath))
+        yield entry
+
+
+def _extract_with_libarchive(filepath: Path, output_dir: PathLike):
+    """
+    Extract `filepath` into `output_dir` with libarchive, which streams the entries through its native decoders.
+    """
+    _check_member_paths(filepath)
+    # the member paths are sanitized and made absolute by `_rooted_entries`, the flags are a second line of defense
+    flags = libarchive.extract.EXTRACT_SECURE_NODOTDOT | libarchive.extract.EXTRACT_SECURE_SYMLINKS
+    os.makedirs(output_dir, exist_ok=True)
+    with libarchive.file_reader(os.fspath(filepath)) as archive:
+        libarchive.extract.extract_entries(_rooted_entries(archive, os.path.realpath(output_dir)), flags=flags)
+
+
+def _make_member_dirs(output_dir: PathLike, infos: Sequence[zipfile.ZipInfo]):
+    """
+    Create the directories of the zip `infos` in one pass, before the members are extracted concurrently.
+    Members with absolute or parent-relative paths are left to `zipfile`, which sanitizes them on extraction.
+    """
+    dirs = set()
+    for info in infos:
+        name = info.filename.rstrip("/") if info.is_dir() else os.path.dirname(info.filename)
+        parts = name.replace("\\", "/").split("/")
+        if name and not os.path.isabs(name) and ".." not in parts:
+            dirs.add(name)
+    for name in sorted(dirs):
+        os.makedirs(Path(output_dir, name), exist_ok=True)
+
+
+def _extract_zip_members(
+        filepath: Path, output_dir: PathLike, infos: Sequence[zipfile.ZipInfo], num_workers: Union[int, None] = None
+):
+    """
+    Extract the zip `infos` into `output_dir` with a thread pool, `zlib` releases the GIL while decompressing.
+    A `ZipFile` handle is not thread-safe, so every worker thread reads through its own handle.
+    """
+    local = threading.local()
+    handles = []
+
+    def _extract(info: zipfile.ZipInfo):
+        zip_file = getattr(local, "zip_file", None)
+        if zip_file is None:
+            zip_file = local.zip_file = zipfile.ZipFile(filepath)
+            handles.append(zip_file)
+        try:
+            zip_file.extract(info, output_dir)
+        except FileExistsError:  # a parent directory was created concurrently by another worker
+            zip_file.extract(info, output_dir)
+
+    try:
+        with ThreadPoolExecutor(max_workers=num_workers or os.cpu_count()) as executor:
+            list(executor.map(_extract, infos))
+    finally:
+        for zip_file in handles:
+            zip_file.close()
 
 
 def extractall(
@@ -240,6 +853,10 @@ def extractall(
     Raises:
         RuntimeError: When the hash validation of the ``filepath`` compressed file fails.
         NotImplementedError: When the ``filepath`` file extension is not one of [zip", "tar.gz", "tar"].
+
+    Note:
+        Tar files are extracted in a single sequential pass. Code that needs random access to the members of a
+        compressed tar should read them from the extracted files, or convert it to an uncompressed tar first.
     """
 
     if has_base:
@@ -257,14 +874,19 @@ def extractall(
     logger.info(f"Writing into directory: {output_dir}")
     _file_type = file_type.lower().strip()
     if filepath.name.endswith("zip") or _file_type == "zip":
-        zip_file = zipfile.ZipFile(filepath)
-        zip_file.extractall(output_dir)
-        zip_file.close()
+        if has_libarchive:
+            _extract_with_libarchive(filepath, output_dir)
+            return
+        with zipfile.ZipFile(filepath) as zip_file:
+            infos = zip_file.infolist()
+        _make_member_dirs(output_dir, infos)
+        _extract_zip_members(filepath, output_dir, infos)
         return
     if filepath.name.endswith("tar") or filepath.name.endswith("tar.gz") or "tar" in _file_type:
-        tar_file = tarfile.open(filepath)
-        tar_file.extractall(output_dir)
-        tar_file.close()
+        # the streaming mode reads the members strictly in archive order and refuses seeks,
+        # as a compressed tar is not random-access and out of order reads would decompress it again from the start
+        with tarfile.open(filepath, mode="r|*") as tar_file:
+            tar_file.extractall(output_dir)
         return
     raise NotImplementedError(
         f"Unsupported file type, available options are: ['zip', 'tar.gz', 'tar']. name={filepath}, type={file_type}."
@@ -280,6 +902,7 @@ def download_and_extract(
         file_type: str = "",
         has_base: bool = True,
         progress: bool = True,
+        expected_size: Union[int, None] = None,
 ) -> None:
     """
     Download file from URL and extract it to the output directory.
@@ -299,31 +922,21 @@ def download_and_extract(
             to folder structure `A/*.png`, this flag should be True; if B.zip is unzipped to `*.png`, this flag should
             be False.
         progress: whether to display progress bar.
+        expected_size: expected size of the downloaded file in bytes. if None, skip size validation.
     """
     with tempfile.TemporaryDirectory() as tmp_dir:
         filename = filepath or Path(tmp_dir, _basename(url)).resolve()
-        download_url(url=url, filepath=filename, hash_val=hash_val, hash_type=hash_type, progress=progress)
+        download_url(
+            url=url,
+            filepath=filename,
+            hash_val=hash_val,
+            hash_type=hash_type,
+            progress=progress,
+            expected_size=expected_size,
+        )
         extractall(filepath=filename, output_dir=output_dir, file_type=file_type, has_base=has_base)
 
 
-def get_hash_val(filepath, hash_type):
-    actual_hash_func = look_up_option(hash_type, SUPPORTED_HASH_TYPES)
-
-    if sys.version_info > (3, 9):
-        actual_hash = actual_hash_func(usedforsecurity=False)
-    else:
-        actual_hash = actual_hash_func()
-
-    try:
-        with open(filepath, "rb") as f:
-            for chunk in iter(lambda: f.read(1024 * 1024), b""):
-                actual_hash.update(chunk)
-    except Exception as e:
-        logger.error("Exception in check_hash: {e}")
-        return False
-    return actual_hash.hexdigest()
-
-
 if __name__ == "__main__":
     root_dir = "/data/result/zhongzhiqiang/MONAI/debug/download_test"
     os.makedirs(root_dir, exist_ok=True)
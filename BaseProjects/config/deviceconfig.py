@@ -1,52 +1,84 @@
 import getpass
 import platform
 import sys
-import monai
-import numpy as np
-import torch
 import re
 import os
 
+from functools import lru_cache
+from importlib import import_module
+from importlib.metadata import PackageNotFoundError, version
+from importlib.util import find_spec
 from typing import OrderedDict, TextIO
 
-import torch.version
-
 from BaseProjects.utils.module import get_package_version, optional_import
 
 psutil, has_psutil = optional_import("psutil")
 psutil_version = psutil.__version__ if has_psutil else "NOT INSTALLED or UNKNOWN VERSION."
+_LINUX_PRETTY_RE = re.compile(r'PRETTY_NAME="(.*)"')
+if has_psutil:
+    # start the measurement window of the non-blocking `psutil.cpu_percent(interval=None)` calls
+    psutil.cpu_percent(interval=None, percpu=True)
 
 
-def get_config_values():
+def _import_if_installed(name: str):
+    """
+    Import the heavy module `name` on demand, return `None` if it is not installed.
+    """
+    if find_spec(name) is None:
+        return None
+    return import_module(name)
+
+
+@lru_cache(maxsize=None)
+def _get_config_values():
     output = OrderedDict()
 
-    output["MONAI"] = monai.__version__
-    output["Numpy"] = np.version.full_version
-    output["Pytorch"] = torch.__version__
+    monai = _import_if_installed("monai")
+    np = _import_if_installed("numpy")
+    torch = _import_if_installed("torch")
+    output["MONAI"] = monai.__version__ if monai is not None else "NOT INSTALLED"
+    output["Numpy"] = np.version.full_version if np is not None else "NOT INSTALLED"
+    output["Pytorch"] = torch.__version__ if torch is not None else "NOT INSTALLED"
 
     return output
 
 
-def get_optional_config_values():
+def get_config_values():
+    # a copy, so that the callers can't modify the cached values
+    return OrderedDict(_get_config_values())
+
+
+@lru_cache(maxsize=None)
+def _get_optional_config_values():
     output = OrderedDict()
+    # display name: (distribution name, import name)
     package_name_dict = {
-        "ITK": "itk",
-        "Nibabel": "nibabel",
-        "scikit-image": "skimage",
-        "Pillow": "PIL",
-        "Tensorboard": "tensorboard",
-        "gdown": "gdown",
-        "TorchVision": "torchvision",
-        "tqdm": "tqdm",
-        "lmdb": "lmdb",
+        "ITK": ("itk", "itk"),
+        "Nibabel": ("nibabel", "nibabel"),
+        "scikit-image": ("scikit-image", "skimage"),
+        "Pillow": ("pillow", "PIL"),
+        "Tensorboard": ("tensorboard", "tensorboard"),
+        "gdown": ("gdown", "gdown"),
+        "TorchVision": ("torchvision", "torchvision"),
+        "tqdm": ("tqdm", "tqdm"),
+        "lmdb": ("lmdb", "lmdb"),
     }
 
-    for name, package_name in package_name_dict.items():
-        output[name] = get_package_version(package_name)
+    for name, (dist_name, package_name) in package_name_dict.items():
+        # reading the installed metadata doesn't execute the package
+        try:
+            output[name] = version(dist_name)
+        except PackageNotFoundError:  # not installed, or installed under another distribution name such as a fork
+            output[name] = get_package_version(package_name)
 
     return output
 
 
+def get_optional_config_values():
+    # a copy, so that the callers can't modify the cached values
+    return OrderedDict(_get_optional_config_values())
+
+
 def print_config(file=sys.stdout):
     for k, v in get_config_values().items():
         print(f"{k} version: {v}", file=file, flush=True)
@@ -66,7 +98,23 @@ def _dict_append(in_dict, key, fn):
         in_dict[key] = "UNKNOWN for given OS"
 
 
-def get_system_info():
+@lru_cache(maxsize=1)
+def _linux_pretty_name():
+    """
+    Get the `PRETTY_NAME` of `/etc/os-release`, `None` if it is not available.
+    """
+    try:
+        with open("/etc/os-release") as rel_f:
+            return _LINUX_PRETTY_RE.search(rel_f.read()).group(1)
+    except (OSError, AttributeError):
+        return None
+
+
+@lru_cache(maxsize=None)
+def _get_static_system_info():
+    """
+    Get the system information which doesn't change within the process.
+    """
     output = OrderedDict()
 
     _dict_append(output, "System", platform.system)
@@ -77,16 +125,38 @@ def get_system_info():
     elif output["System"] == "Darwin":
         _dict_append(output, "Mac version", lambda: platform.mac_ver()[0])
     else:
-        with open("/etc/os-release") as rel_f:
-            linux_ver = re.search(r'PRETTY_NAME="(.*)"', rel_f.read())
+        linux_ver = _linux_pretty_name()
         if linux_ver:
-            _dict_append(output, "Linux version", lambda: linux_ver.group(1))
-    
+            _dict_append(output, "Linux version", linux_ver)
+
     _dict_append(output, "Plaform", platform.platform)
     _dict_append(output, "Processor", platform.processor)
     _dict_append(output, "Machine", platform.machine)
     _dict_append(output, "Python version", platform.python_version)
 
+    if has_psutil:
+        _dict_append(output, "Num physical CPUs", lambda: psutil.cpu_count(logical=False))
+        _dict_append(output, "Num logical CPUs", lambda: psutil.cpu_count(logical=True))
+        _dict_append(output, "Total physical memory (GB)", lambda: round(psutil.virtual_memory().total / 1024**3, 1))
+
+    return output
+
+
+def _avg_sensor_temperature():
+    import numpy as np
+
+    return np.round(
+        np.mean([item.current for sublist in psutil.sensors_temperatures().values() for item in sublist]), 1
+    )
+
+
+def _get_dynamic_system_info(dynamic: bool = True, sensors: bool = True):
+    """
+    Get the process information, and if `dynamic`, a snapshot of the system usage.
+    The sensor temperatures are only collected if `sensors` is also True.
+    """
+    output = OrderedDict()
+
     if not has_psutil:
         _dict_append(output, "`psutil` missing", lambda: "run `pip install psutil`")
     else:
@@ -95,40 +165,72 @@ def get_system_info():
             _dict_append(output, "Process name", p.name)
             _dict_append(output, "Command", p.cmdline)
             _dict_append(output, "Open files", p.open_files)
-            _dict_append(output, "Num physical CPUs", lambda: psutil.cpu_count(logical=False))
-            _dict_append(output, "Num logical CPUs", lambda: psutil.cpu_count(logical=True))
             _dict_append(output, "Num usable CPUs", lambda: len(psutil.Process().cpu_affinity()))
-            _dict_append(output, "CPU usage (%)", lambda: psutil.cpu_percent(percpu=True))
-            _dict_append(output, "CPU freq. (MHz)", lambda: round(psutil.cpu_freq(percpu=False)[0]))
-            _dict_append(
-                output,
-                "Load avg. in last 1, 5, 15 mins (%)",
-                lambda: [round(x / psutil.cpu_count() * 100, 1) for x in psutil.getloadavg()],
-            )
-            _dict_append(output, "Disk usage (%)", lambda: psutil.disk_usage(os.getcwd()).percent)
-            _dict_append(
-                output,
-                "Avg. sensor temp. (Celsius)",
-                lambda: np.round(
-                    np.mean([item.current for sublist in psutil.sensors_temperatures().values() for item in sublist]), 1
-                ),
-            )
-            mem = psutil.virtual_memory()
-            _dict_append(output, "Total physical memory (GB)", lambda: round(mem.total / 1024**3, 1))
-            _dict_append(output, "Available memory (GB)", lambda: round(mem.available / 1024**3, 1))
-            _dict_append(output, "Used memory (GB)", lambda: round(mem.used / 1024**3, 1))
+            if dynamic:
+                _dict_append(output, "CPU usage (%)", lambda: psutil.cpu_percent(interval=None, percpu=True))
+                _dict_append(output, "CPU freq. (MHz)", lambda: round(psutil.cpu_freq(percpu=False)[0]))
+                _dict_append(
+                    output,
+                    "Load avg. in last 1, 5, 15 mins (%)",
+                    lambda: [round(x / psutil.cpu_count() * 100, 1) for x in psutil.getloadavg()],
+                )
+                _dict_append(output, "Disk usage (%)", lambda: psutil.disk_usage(os.getcwd()).percent)
+                if sensors:
+                    _dict_append(output, "Avg. sensor temp. (Celsius)", _avg_sensor_temperature)
+                mem = psutil.virtual_memory()
+                _dict_append(output, "Available memory (GB)", lambda: round(mem.available / 1024**3, 1))
+                _dict_append(output, "Used memory (GB)", lambda: round(mem.used / 1024**3, 1))
 
     return output
 
 
-def print_system_info(file=sys.stdout):
-    for k, v in get_system_info().items():
+def get_system_info(dynamic: bool = True, sensors: bool = True):
+    """
+    Get the system information.
+
+    Args:
+        dynamic: whether to collect the CPU, load, disk and memory usage, otherwise only the static
+            and the process information is returned.
+        sensors: whether to collect the sensor temperatures, only used when `dynamic` is True.
+    """
+    output = OrderedDict(_get_static_system_info())
+    output.update(_get_dynamic_system_info(dynamic, sensors))
+    return output
+
+
+def print_system_info(file=sys.stdout, dynamic: bool = True):
+    for k, v in get_system_info(dynamic).items():
         print(f"{k}: {v}", file=file, flush=True)
 
     
+@lru_cache(maxsize=None)
+def _get_gpu_device_info(num_gpus: int):
+    """
+    Get the properties of the `num_gpus` devices, which don't change within the process.
+    """
+    import torch
+
+    output = OrderedDict()
+
+    for gpu in range(num_gpus):
+        gpu_info = torch.cuda.get_device_properties(gpu)
+        _dict_append(output, f"GPU {gpu} Name", gpu_info.name)
+        _dict_append(output, f"GPU {gpu} Is integrated", gpu_info.is_integrated)
+        _dict_append(output, f"GPU {gpu} Is multi GPU board", bool(gpu_info.is_multi_gpu_board))
+        _dict_append(output, f"GPU {gpu} Multi processor count", gpu_info.multi_processor_count)
+        _dict_append(output, f"GPU {gpu} Total memory (GB)", round(gpu_info.total_memory / 1024**3, 1))
+        _dict_append(output, f"GPU {gpu} CUDA capability (maj.min)", f"{gpu_info.major}.{gpu_info.minor}")
+
+    return output
+
+
 def get_gpu_info():
     output = OrderedDict()
 
+    torch = _import_if_installed("torch")
+    if torch is None:
+        _dict_append(output, "Pytorch", "NOT INSTALLED")
+        return output
     num_gpus = torch.cuda.device_count()
     _dict_append(output, "Num GPUs", lambda: num_gpus)
 
@@ -147,14 +249,7 @@ def get_gpu_info():
         _dict_append(output, "Current device", torch.cuda.current_device)
         _dict_append(output, "Library compiled for CUDA architectures", torch.cuda.get_arch_list)
 
-    for gpu in range(num_gpus):
-        gpu_info = torch.cuda.get_device_properties(gpu)
-        _dict_append(output, f"GPU {gpu} Name", gpu_info.name)
-        _dict_append(output, f"GPU {gpu} Is integrated", gpu_info.is_integrated)
-        _dict_append(output, f"GPU {gpu} Is multi GPU board", bool(gpu_info.is_multi_gpu_board))
-        _dict_append(output, f"GPU {gpu} Multi processor count", gpu_info.multi_processor_count)
-        _dict_append(output, f"GPU {gpu} Total memory (GB)", round(gpu_info.total_memory / 1024**3, 1))
-        _dict_append(output, f"GPU {gpu} CUDA capability (maj.min)", f"{gpu_info.major}.{gpu_info.minor}")
+    output.update(_get_gpu_device_info(num_gpus))
 
     return output
 
@@ -1,21 +1,81 @@
+import os
 import random
+import sys
 import warnings
-from typing import Union, Sequence, Callable, Any, Iterable
+from functools import lru_cache
+from typing import TYPE_CHECKING, NamedTuple, Union, Sequence, Callable, Any, Iterable
 
-import numpy as np
-import torch
+if TYPE_CHECKING:
+    import numpy as np
 
+# numpy and torch are imported on first use, importing this module doesn't pay their import time
 _seed = None
-_flag_deterministic = torch.backends.cudnn.deterministic
-_flag_cudnn_benchmark = torch.backends.cudnn.benchmark
-NP_MAX = np.iinfo(np.uint32).max
+_global_rng = None
+_original_flags = None
+NP_MAX = 4294967295  # np.iinfo(np.uint32).max
 MAX_SEED = NP_MAX + 1
+# the result of `is_sequence_iterable` for the common builtin types, avoiding the slow `Iterable` ABC check
+_BUILTIN_SEQUENCE_ITERABLE = {
+    list: True,
+    tuple: True,
+    set: True,
+    frozenset: True,
+    dict: True,
+    str: False,
+    bytes: False,
+    int: False,
+    float: False,
+    bool: False,
+    type(None): False,
+}
+
+
+class _CudnnFlags(NamedTuple):
+    deterministic: bool
+    benchmark: bool
+
+
+def _get_original_flags() -> _CudnnFlags:
+    """
+    Get the cudnn flags as they were before `set_determinism` first changed them,
+    they are restored when `set_determinism` is called with `seed=None`.
+    """
+    global _original_flags
+    if _original_flags is None:
+        import torch
+
+        _original_flags = _CudnnFlags(torch.backends.cudnn.deterministic, torch.backends.cudnn.benchmark)
+    return _original_flags
+
+
+@lru_cache(maxsize=1)
+def _deterministic_algorithms_setter():
+    """
+    Get the PyTorch function to set the deterministic algorithms mode, `None` if the PyTorch version is too old.
+    """
+    import torch
+
+    # `use_deterministic_algorithms` is new in torch 1.8.0, `set_deterministic` is new in torch 1.7.0
+    return getattr(torch, "use_deterministic_algorithms", None) or getattr(torch, "set_deterministic", None)
+
+
+def _is_array(obj: Any) -> bool:
+    """
+    Whether `obj` is a numpy array or a torch tensor, without importing either library.
+    """
+    np_mod, torch_mod = sys.modules.get("numpy"), sys.modules.get("torch")
+    return (np_mod is not None and isinstance(obj, np_mod.ndarray)) or (
+        torch_mod is not None and isinstance(obj, torch_mod.Tensor)
+    )
 
 
 def is_sequence_iterable(obj: Any) -> bool:
     """
     Determine if the object is an iterable sequence and is not a string.
     """
+    builtin = _BUILTIN_SEQUENCE_ITERABLE.get(type(obj))
+    if builtin is not None:
+        return builtin
     try:
         if hasattr(obj, "ndim") and obj.ndim == 0:
             return False  # a 0-d tensor is not iterable
@@ -34,11 +94,48 @@ def ensure_tuple(vals: Any, wrap_array: bool = False) -> tuple:
             if `False`, try to convert the array with `tuple(vals)`, default to `False`.
 
     """
-    if wrap_array and isinstance(vals, (np.ndarray, torch.Tensor)):
+    t = type(vals)
+    if t is tuple:
+        return vals
+    if t is list:
+        return tuple(vals)
+    if t is str or t is bytes:
+        return (vals,)
+    if wrap_array and _is_array(vals):
         return (vals,)
     return tuple(vals) if is_sequence_iterable(vals) else (vals,)
 
 
+def get_rng() -> "np.random.Generator":
+    """
+    Get the module level `numpy.random.Generator`, which is seeded by `set_determinism` and `seed_worker`.
+    Prefer it over the legacy global `numpy.random` functions, its default PCG64 bit generator is faster per draw.
+    """
+    global _global_rng
+    if _global_rng is None:
+        import numpy as np
+
+        _global_rng = np.random.default_rng()
+    return _global_rng
+
+
+def seed_worker(worker_id: int) -> None:
+    """
+    Seed `random`, `numpy` and the generator of `get_rng()` of a DataLoader worker,
+    to be used as the `worker_init_fn` of the DataLoader.
+    PyTorch gives each worker a distinct torch seed but doesn't reseed the other random generators, so the workers
+    would otherwise produce duplicated random augmentations.
+    """
+    import numpy as np
+    import torch
+
+    global _global_rng
+    worker_seed = torch.initial_seed() % MAX_SEED
+    np.random.seed(worker_seed)
+    random.seed(worker_seed)
+    _global_rng = np.random.default_rng(worker_seed)
+
+
 def set_determinism(
         seed: Union[int, None] = NP_MAX,
         use_deterministic_algorithms: Union[bool, None] = None,
@@ -52,6 +149,8 @@ def set_determinism(
             It is recommended to set a large seed, i.e. a number that has a good balance
             of 0 and 1 bits. Avoid having many 0 bits in the seed.
             if set to None, will disable deterministic training.
+            the seeds of `random`, `numpy`, `torch`, CUDA and the generator of `get_rng()` are derived from it
+            with `numpy.random.SeedSequence`, so that their random streams are independent.
         use_deterministic_algorithms: Set whether PyTorch operations must use "deterministic" algorithms.
         additional_settings: additional settings that need to set random seed.
 
@@ -63,40 +162,62 @@ def set_determinism(
         according to the global random state, please see also: :py:class:`monai.data.utils.worker_init_fn` and
         :py:class:`monai.data.utils.set_rnd`).
     """
+    import numpy as np
+    import torch
+
+    global _seed, _global_rng
+    # snapshot the flags before any change, the flags set by the caller after importing this module are kept
+    original_flags = _get_original_flags()
 
     # seed must be in the range of MAX_SEED
     if seed is None:
         # cast to 32 bit seed for CUDA
         seed_ = torch.default_generator.seed() % MAX_SEED
         torch.manual_seed(seed_)
+        random.seed(None)
+        np.random.seed(None)
+        rng = np.random.default_rng()
     else:
         seed = int(seed) % MAX_SEED
-        torch.manual_seed(seed)
+        # derive statistically independent seeds for each random generator from the single seed
+        seed_seq = np.random.SeedSequence(seed)
+        py_seed, np_seed, torch_seed, cuda_seed = (int(x) for x in seed_seq.generate_state(4))
+        torch.manual_seed(torch_seed)
+        torch.cuda.manual_seed_all(cuda_seed)
+        random.seed(py_seed)
+        np.random.seed(np_seed)
+        rng = np.random.default_rng(seed_seq.spawn(1)[0])
 
-    global _seed
     _seed = seed
-    random.seed(seed)
-    np.random.seed(seed)
+    _global_rng = rng
 
     if additional_settings is not None:
-        additional_settings = ensure_tuple(additional_settings)
-        for func in additional_settings:
-            func(seed)
-
-    if torch.backends.flags_frozen():
-        warnings.warn("PyTorch global flag support of backends is disabled, enable it to set global `cudnn` flags.")
-        torch.backends.__allow_nonbracketed_mutation_flag = True
+        if callable(additional_settings):
+            additional_settings(seed)
+        else:
+            for func in additional_settings:
+                func(seed)
 
     if seed is not None:
-        torch.backends.cudnn.deterministic = True
-        torch.backends.cudnn.benchmark = False
+        deterministic, benchmark = True, False
     else:
-        torch.backends.cudnn.deterministic = _flag_deterministic
-        torch.backends.cudnn.benchmark = _flag_cudnn_benchmark
+        deterministic, benchmark = original_flags
+    # only touch the backend flags when they change, repeated calls (e.g. from each worker) skip the setters
+    cudnn = torch.backends.cudnn
+    if cudnn.deterministic != deterministic or cudnn.benchmark != benchmark:
+        if torch.backends.flags_frozen():
+            warnings.warn("PyTorch global flag support of backends is disabled, enable it to set global `cudnn` flags.")
+            torch.backends.__allow_nonbracketed_mutation_flag = True
+        if cudnn.deterministic != deterministic:
+            cudnn.deterministic = deterministic
+        if cudnn.benchmark != benchmark:
+            cudnn.benchmark = benchmark
+    if use_deterministic_algorithms:
+        # required by the deterministic cuBLAS matmul with CUDA >= 10.2
+        os.environ.setdefault("CUBLAS_WORKSPACE_CONFIG", ":4096:8")
     if use_deterministic_algorithms is not None:
-        if hasattr(torch, "use_deterministic_algorithms"):  # `use_deterministic_algorithms` is new in torch 1.8.0
-            torch.use_deterministic_algorithms(use_deterministic_algorithms)
-        elif hasattr(torch, "set_deterministic"):   # `set_deterministic` is new in torch 1.7.0
-            torch.set_deterministic(use_deterministic_algorithms)
+        set_deterministic = _deterministic_algorithms_setter()
+        if set_deterministic is not None:
+            set_deterministic(use_deterministic_algorithms)
         else:
             warnings.warn("use_deterministic_algorithms=True, but PyTorch version is too old to set the mode.")
\ No newline at end of file
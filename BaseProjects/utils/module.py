@@ -1,7 +1,40 @@
+import difflib
 import enum
+import re
+import sys
+from functools import lru_cache, wraps
 from importlib import import_module
 from collections.abc import Collection, Hashable, Mapping
-from typing import Any, Union
+from typing import Any, Callable, NamedTuple, Union
+
+__all__ = ["look_up_option", "min_version", "optional_import", "get_package_version"]
+
+_MISSING = object()
+# below this number of options `difflib` is fast enough, and it doesn't pay the `rapidfuzz` import
+_FUZZY_MATCH_MIN_OPTIONS = 8
+
+
+@lru_cache(maxsize=None)
+def _enum_value_set(enum_cls: enum.EnumMeta) -> frozenset:
+    """
+    Get the set of member values of `enum_cls`, computed once per Enum class.
+    """
+    return frozenset(item.value for item in enum_cls)
+
+
+def _closest_option(opt_str: str, options: list) -> Union[str, None]:
+    """
+    Get the option most similar to `opt_str`, `None` if none of them is close enough.
+    `rapidfuzz` is used for the larger collections if it is installed, otherwise `difflib`.
+    """
+    if len(options) >= _FUZZY_MATCH_MIN_OPTIONS:
+        process, has_rapidfuzz = optional_import("rapidfuzz", name="process")
+        if has_rapidfuzz:
+            fuzz = optional_import("rapidfuzz", name="fuzz")[0]
+            guess = process.extractOne(opt_str, options, scorer=fuzz.WRatio, score_cutoff=60)
+            return guess[0] if guess else None
+    guesses = difflib.get_close_matches(opt_str, options, n=1)
+    return guesses[0] if guesses else None
 
 
 def look_up_option(
@@ -42,12 +75,22 @@ def look_up_option(
     Adapted from https://github.com/NifTK/NiftyNet/blob/v0.6.0/niftynet/utilities/util_common.py#L249
     """
 
+    # fast path of the common exact hits of a string in a dict or a set
+    if type(opt_str) is str:
+        supported_type = type(supported)
+        if supported_type is dict:
+            value = supported.get(opt_str, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif (supported_type is set or supported_type is frozenset) and opt_str in supported:
+            return opt_str
+
     if not isinstance(opt_str, Hashable):
         raise ValueError(f"Unrecognized option type: {type(opt_str)}: {opt_str}.")
     if isinstance(opt_str, str):
         opt_str = opt_str.strip()
     if isinstance(supported, enum.EnumMeta):
-        if isinstance(opt_str, str) and opt_str in {item.value for item in supported}:
+        if isinstance(opt_str, str) and opt_str in _enum_value_set(supported):
             return supported(opt_str)  # such as: "example" in MyEnum
         if isinstance(opt_str, enum.Enum) and opt_str in supported:
             return opt_str  # such as: MyEnum.EXAMPLE in MyEnum
@@ -61,13 +104,30 @@ def look_up_option(
 
     set_to_check: set
     if isinstance(supported, enum.EnumMeta):
-        set_to_check = {item.value for item in supported}
+        set_to_check = set(_enum_value_set(supported))
     else:
         set_to_check = set(supported) if supported is not None else set()
     if not set_to_check:
         raise ValueError(f"No options available: {supported}")
     support_msg = f"Available options are {set_to_check}" if print_all_options else ""
-    raise ValueError(f"Unsupported option '{opt_str}', " + support_msg)
+    guess = _closest_option(f"{opt_str}", [f"{item}" for item in set_to_check])
+    guess_msg = f"By '{opt_str}', did you mean '{guess}'?\n" if guess is not None else ""
+    raise ValueError(guess_msg + f"Unsupported option '{opt_str}', " + support_msg)
+
+
+@lru_cache(maxsize=256)
+def _parse_version(version_str: str) -> tuple:
+    """
+    Parse the major and minor numbers of `version_str`, such as `"1.10rc1"` -> `(1, 10)`.
+    """
+    parsed = []
+    for x in version_str.split(".")[:2]:
+        try:
+            parsed.append(int(x))
+        except ValueError:  # non-numeric segment, keep its leading digits
+            digits = re.match(r"\d*", x).group()
+            parsed.append(int(digits) if digits else 0)
+    return tuple(parsed)
 
 
 def min_version(the_module: Any, min_version_str: str = ""):
@@ -77,25 +137,152 @@ def min_version(the_module: Any, min_version_str: str = ""):
     Returns True if the module's version is greater or equal to the 'min_version'.
     When min_version_str is not provided, it always returns True.
     """
-    if not min_version_str or not hasattr(the_module, "__version__"):
+    mod_version = getattr(the_module, "__version__", None)
+    if not min_version_str or mod_version is None:
         return True
+    if mod_version == min_version_str:
+        return True
+    return _parse_version(mod_version) >= _parse_version(min_version_str)
+
+
+def _describe_import(module: str, version: str = "", name: str = "") -> str:
+    desc = f"'from {module} import {name}'" if name else f"'import {module}'"
+    return f"{desc} (requires version >= {version})" if version else desc
+
+
+class _LazyImport:
+    """
+    Base of the lazy optional import objects, it is falsy if the optional module is not available.
+    """
 
-    mod_version = tuple(int(x) for x in the_module.__version__.split(".")[:2])
-    required = tuple(int(x) for x in min_version_str.split(".")[:2])
-    return mod_version >= required
+    __slots__ = ("_module", "_version", "_name")
+
+    def __init__(self, module: str, version: str = "", name: str = ""):
+        self._module = module
+        self._version = version
+        self._name = name
+
+    def _missing_error(self) -> ImportError:
+        return ImportError(
+            f"Optional dependency {_describe_import(self._module, self._version, self._name)} is not available."
+        )
+
+    def require_in_call(self, func: Callable) -> Callable:
+        """
+        Decorate `func` to raise an `ImportError` when it is called while the optional module is not available.
+        """
+
+        @wraps(func)
+        def _wrapper(*args, **kwargs):
+            if not self:
+                raise self._missing_error()
+            return func(*args, **kwargs)
+
+        return _wrapper
+
+    def __bool__(self):
+        return _optional_import(self._module, self._version, self._name)[1]
+
+
+class _LazyModule(_LazyImport):
+    """
+    Proxy of an optional module which is imported on the first attribute access or call,
+    or of an optional import which is not available, raising an `ImportError` when it is used.
+    It is only used for whole modules, as a proxy is not equal to the proxied object and doesn't work with `isinstance`.
+    """
+
+    __slots__ = ("_resolved",)
+
+    def __init__(self, module: str, version: str = "", name: str = ""):
+        super().__init__(module, version, name)
+        self._resolved = None
+
+    def require_now(self):
+        """
+        Import the optional module and return it, raise an `ImportError` if it is not available.
+        """
+        if self._resolved is None:
+            the_module, has_module = _optional_import(self._module, self._version, self._name)
+            if not has_module:
+                raise self._missing_error()
+            self._resolved = the_module
+        return self._resolved
+
+    def __getattr__(self, attr: str):
+        return getattr(self.require_now(), attr)
+
+    def __call__(self, *args, **kwargs):
+        return self.require_now()(*args, **kwargs)
+
+    def __repr__(self):
+        return f"<lazy {_describe_import(self._module, self._version, self._name)}>"
+
+
+class _LazyImportTester(_LazyImport):
+    """
+    Whether an optional module is available, the import is only attempted when it is tested with `bool()`
+    or compared, such as `has_module == False`. It is not a `bool` instance, so `has_module is False` is always False.
+    """
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return bool(self) == other
+
+    def __hash__(self):
+        return hash(bool(self))
+
+    def __repr__(self):
+        # doesn't attempt the import, so that logging the flag keeps it lazy
+        return f"<availability of {_describe_import(self._module, self._version, self._name)}>"
+
+
+class _OptionalImport(NamedTuple):
+    """
+    The result of `optional_import`, it unpacks to `(module, available)` and is truthy if the module is available.
+    """
+
+    module: Any
+    available: _LazyImportTester
+
+    def __bool__(self):
+        return bool(self.available)
 
 
 def optional_import(
         module: str,
         version: str = "",
         name: str = ""
-):
+) -> _OptionalImport:
     """
     Imports an optional module specified by `module` string.
+
+    The import of a whole module which is not imported yet is deferred: the returned module is a proxy which
+    imports `module` on its first attribute access or call, and the returned flag only attempts the import
+    when it is tested, such as `if has_module:`. An attribute `name`, or a module which is already imported,
+    is resolved immediately and returned as is, so that `isinstance` and equality checks with it are correct.
+    The resolution is memoized, including failed imports, so repeated uses don't go through the import machinery.
+
+    Both the module and the flag are falsy if the module is not available, accessing the missing module raises an
+    `ImportError`. Use `has_module.require_in_call` to decorate the functions which depend on the module,
+    so that they raise the same `ImportError` when called without it.
+
+    Returns:
+        the module or its attribute `name`, and a flag of whether it is available.
+        the result itself is also truthy only if the module is available, e.g. `if optional_import("tqdm"):`.
     """
+    available = _LazyImportTester(module, version, name)
+    if name or module in sys.modules:
+        the_module, has_module = _optional_import(module, version, name)
+        if has_module:
+            return _OptionalImport(the_module, available)
+    return _OptionalImport(_LazyModule(module, version, name), available)
+
+
+@lru_cache(maxsize=None)
+def _optional_import(module: str, version: str, name: str):
     try:
-        pkg = __import__(module)
-        the_module = import_module(module)
+        the_module = sys.modules.get(module) or import_module(module)
         is_namespace = getattr(the_module, "__file__", None) is None and hasattr(the_module, "__path__")
         if is_namespace:
             raise AssertionError